@@ -0,0 +1,342 @@
+from flask import Flask, request, Response
+import hashlib
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from lxml import etree
+import fcntl
+import os
+import random
+import sys
+import threading
+import time
+import re
+import json
+from datetime import datetime
+from email.utils import formatdate
+
+app = Flask(__name__)
+
+# Pooled HTTP session so refreshes reuse the TCP/TLS connection to Google
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+SESSION.headers['Accept-Encoding'] = 'gzip'
+
+# Last-Modified value from the previous fetch, echoed back as
+# If-Modified-Since so an unchanged feed costs a bodyless 304
+_last_modified = None
+
+# Only the process holding LOCK_FILE fetches the feed; the others load
+# the state file it writes
+LOCK_FILE = '/tmp/crypto_news.lock'
+STATE_FILE = '/tmp/crypto_news_state.json'
+
+# Shared cache updated by the background refresh thread
+cache = {
+    'news': [],
+    'last_update': None,
+    'news_json': None,
+    'last_modified': None,
+    'etag': None,
+    'news_array': b'',
+    'item_offsets': [],
+    'status_body': None
+}
+
+
+# Compiled once at import
+_WS_RE = re.compile(r'\s+')
+
+
+def parse_summary(summary_html):
+    """Parse an item's description HTML once, returning (link, source, summary)"""
+    soup = BeautifulSoup(summary_html, 'lxml')
+    link_tag = soup.find('a')
+    link = link_tag.get('href', '') if link_tag else ''
+    text = soup.get_text()
+    summary = _WS_RE.sub(' ', text).strip()
+    # Intern sources: the same handful of outlet names recurs across items
+    source = sys.intern(text.rsplit('\xa0', 1)[-1].strip()) if link_tag else ''
+    return link, source, summary
+
+
+def fetch_news():
+    """Fetch crypto news from Google News RSS feed
+
+    Returns None on a 304, signaling the cached items are still current.
+    """
+    global _last_modified
+    url = "https://news.google.com/rss/search?q=cryptocurrency+OR+bitcoin+OR+crypto&hl=en-US&gl=US&ceid=US:en"
+
+    headers = {'If-Modified-Since': _last_modified} if _last_modified else {}
+
+    # Stream the response body straight into the parser so parsing
+    # overlaps the download and the feed is never fully materialized
+    news_items = []
+    with SESSION.get(url, headers=headers, stream=True,
+                     timeout=(3.05, 10)) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        last_modified = response.headers.get('Last-Modified')
+        response.raw.decode_content = True
+        context = etree.iterparse(response.raw, events=('end',), tag='item')
+        for _, item in context:
+            summary_html = item.findtext('description', '')
+            link, source, summary = parse_summary(summary_html)
+
+            news_items.append({
+                'title': item.findtext('title', ''),
+                'link': link,
+                'published_date': item.findtext('pubDate', ''),
+                'summary': summary,
+                'source': source
+            })
+
+            # Free processed elements so the working set stays at one item
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+
+    # Commit only after a complete parse, so a stream that dies midway
+    # cannot make the next poll 304 against a version we never cached
+    _last_modified = last_modified
+    return news_items
+
+
+def save_news(news_items):
+    """Save a snapshot of the fetched news to disk"""
+    filename = f"news_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(filename, 'w') as f:
+        json.dump(news_items, f, indent=2)
+
+
+def rebuild_cache(news_items, last_update):
+    """Publish news items to the cache with precomputed response bytes
+
+    last_update is the fetch time recorded by whichever worker fetched,
+    so every worker serializes identical bytes and agrees on the ETag.
+    """
+    global cache
+    # Serialize once per refresh instead of on every request.
+    # Items are encoded individually so prefix responses can be
+    # spliced out of the same bytes by offset.
+    item_blobs = [orjson.dumps(item) for item in news_items]
+    news_array = b','.join(item_blobs)
+    item_offsets = []
+    end = 0
+    for blob in item_blobs:
+        end += len(blob) if not item_offsets else len(blob) + 1
+        item_offsets.append(end)
+    news_json = (
+        b'{"status":"success","last_update":"'
+        + last_update.strftime('%Y-%m-%d %H:%M:%S').encode()
+        + b'","count":' + str(len(news_items)).encode()
+        + b',"news":[' + news_array + b']}'
+    )
+    # Rebind the whole dict in one assignment so request threads
+    # never observe news and last_update out of sync
+    cache = {
+        **cache,
+        'news': news_items,
+        'last_update': last_update,
+        'news_json': news_json,
+        'last_modified': formatdate(last_update.timestamp(), usegmt=True),
+        'etag': hashlib.blake2b(news_json, digest_size=16).hexdigest(),
+        'news_array': news_array,
+        'item_offsets': item_offsets,
+        'status_body': orjson.dumps({
+            'status': 'online',
+            'last_update': last_update.strftime('%Y-%m-%d %H:%M:%S'),
+            'news_count': len(news_items)
+        })
+    }
+
+
+def refresh_cache():
+    """Fetch the feed once and publish it to the cache and state file"""
+    news_items = fetch_news()
+    if news_items is None:
+        # Feed unchanged since the last fetch; keep the current cache
+        return
+    now = datetime.now()
+    rebuild_cache(news_items, now)
+    save_news(news_items)
+    # Write-then-rename so other workers never read a torn state file;
+    # the fetch time travels with the items so followers rebuild the
+    # exact same bytes
+    tmp_file = STATE_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump({'last_update': now.isoformat(), 'news': news_items}, f)
+    os.replace(tmp_file, STATE_FILE)
+
+
+def load_state():
+    """Rebuild the local cache from the shared state file"""
+    with open(STATE_FILE) as f:
+        state = json.load(f)
+    rebuild_cache(state['news'], datetime.fromisoformat(state['last_update']))
+
+
+def warm_cache():
+    """Warm the cache at boot with a single upstream fetch per host
+
+    The worker that wins the lock fetches (or serves a previous run's
+    state straight away); the rest load the state file rather than
+    piling N simultaneous fetches onto the feed at deploy time.
+    """
+    with open(LOCK_FILE, 'w') as lock_fh:
+        try:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # A sibling worker is fetching; pick up its state file as
+            # soon as it lands instead of fetching in parallel
+            for _ in range(50):
+                if os.path.exists(STATE_FILE):
+                    load_state()
+                    return
+                time.sleep(0.2)
+            return
+        if os.path.exists(STATE_FILE):
+            # A previous run's state is good enough to start serving;
+            # the refresh loop fetches on its first tick anyway
+            load_state()
+        else:
+            refresh_cache()
+
+
+def update_cache():
+    """Refresh the news cache every 5 minutes
+
+    Only the worker holding the file lock fetches from Google; the rest
+    reload the state file it writes, so multi-worker deployments make a
+    single upstream request per cycle.
+    """
+    lock_fh = open(LOCK_FILE, 'w')
+    while True:
+        try:
+            try:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                have_lock = True
+            except BlockingIOError:
+                have_lock = False
+            if have_lock:
+                refresh_cache()
+            else:
+                # Another worker holds the lock; pick up its fetch
+                load_state()
+        except Exception as e:
+            print(f"Error updating cache: {e}")
+        # Jitter so replicas deployed together do not fetch in lockstep
+        time.sleep(300 + random.uniform(0, 10))
+
+
+def ojsonify(obj):
+    """Build a JSON response through orjson's C encoder"""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+
+# The index payload never changes; encode it once at import
+HOME_BODY = orjson.dumps({
+    'status': 'online',
+    'endpoints': {
+        '/news': 'Get all cached news',
+        '/news/latest/<count>': 'Get the latest <count> news items',
+        '/status': 'Get service status'
+    }
+})
+
+
+@app.route('/')
+def home():
+    return Response(HOME_BODY, mimetype='application/json')
+
+
+def not_modified(etag):
+    """16-byte 304 response for revalidation requests"""
+    return '', 304, {
+        'ETag': etag,
+        'Cache-Control': 'public, max-age=300'
+    }
+
+
+@app.route('/news')
+def get_news():
+    # Snapshot the cache dict once so a concurrent rebind cannot tear
+    # the body, ETag and Last-Modified apart mid-request
+    c = cache
+    if c['etag'] and request.headers.get('If-None-Match') == c['etag']:
+        return not_modified(c['etag'])
+    if c['news_json'] is None:
+        # First refresh has not completed yet
+        response = ojsonify({
+            'status': 'success',
+            'last_update': None,
+            'count': 0,
+            'news': []
+        })
+    else:
+        response = Response(c['news_json'], mimetype='application/json')
+        response.headers['Last-Modified'] = c['last_modified']
+        response.headers['ETag'] = c['etag']
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+@app.route('/news/latest/<int:count>')
+def get_latest_news(count):
+    # Snapshot the cache dict once so the offsets are never applied to
+    # a newer array rebound mid-request
+    c = cache
+    if c['etag'] and request.headers.get('If-None-Match') == c['etag']:
+        return not_modified(c['etag'])
+    # Splice the prefix out of the serialized array by byte offset, so
+    # every count shares the bytes built in update_cache
+    offsets = c['item_offsets']
+    n = min(count, len(offsets))
+    prefix = c['news_array'][:offsets[n - 1]] if n else b''
+    body = (
+        b'{"status":"success","count":' + str(n).encode()
+        + b',"news":[' + prefix + b']}'
+    )
+    response = Response(body, mimetype='application/json')
+    if c['etag']:
+        response.headers['ETag'] = c['etag']
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+@app.route('/status')
+def get_status():
+    c = cache
+    if c['status_body'] is None:
+        # First refresh has not completed yet
+        response = ojsonify({
+            'status': 'online',
+            'last_update': None,
+            'news_count': 0
+        })
+    else:
+        response = Response(c['status_body'], mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+
+# Warm the cache synchronously so /news never serves an empty list
+try:
+    warm_cache()
+except Exception as e:
+    print(f"Error during initial fetch: {e}")
+
+# Start the background refresh thread
+update_thread = threading.Thread(target=update_cache, daemon=True)
+update_thread.start()
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=10000)
@@ -1,5 +1,13 @@
-workers = 4
+import os
+
+workers = os.cpu_count() or 4
 bind = "0.0.0.0:10000"
 timeout = 120
 worker_class = "gthread"
-threads = 4
\ No newline at end of file
+threads = 6
+
+
+def post_fork(server, worker):
+    # Pin each worker to one core so its threads stop migrating and
+    # contending across cores
+    os.sched_setaffinity(0, {worker.age % (os.cpu_count() or 1)})